@@ -1,12 +1,55 @@
 """Evaluation code: determines if an aircraft is affected by an AD."""
 from __future__ import annotations
 import re
-from models import AircraftConfig, AirworthinessDirective
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from models import (
+    AircraftConfig,
+    AirworthinessDirective,
+    ApplicabilityRules,
+    MsnConstraint,
+    normalize_model,
+)
+try:
+    # Optional: vectorized MSN checks in evaluate_fleet
+    import numpy as np
+except ImportError:
+    np = None
 
+# Below this many (aircraft, AD) pairs the scalar MSN check is faster than NumPy
+_NUMPY_MIN_PAIRS = 4096
 
-def normalize_model(model: str) -> str:
-    """Normalize model string for comparison."""
-    return model.strip().upper().replace(" ", "-").replace("–", "-")
+# Patterns applied to lowercased modification strings
+_AM_SB_RE = re.compile(r'a3\d{2}-\d{2}-\d{4}')
+_REV_RE = re.compile(r'rev(?:ision)?\s*(\d+)')
+_MOD_NUM_RE = re.compile(r'\bmod(?:ification)?\s*(?:\(mod\)\s*)?(\d{4,6})\b')
+_BARE_MOD_RE = re.compile(r'\d{4,6}')
+
+
+def _model_suffixes(norm_models: frozenset[str]) -> frozenset[str]:
+    """Every suffix (including the full string) of a set of normalized AD models."""
+    return frozenset(
+        norm_ad[j:] for norm_ad in norm_models for j in range(len(norm_ad) + 1)
+    )
+
+
+def _normalized_model_matches(
+    norm_aircraft: str, norm_models: frozenset[str], model_suffixes: frozenset[str]
+) -> bool:
+    """
+    Match a normalized aircraft model against a set of normalized AD models.
+
+    model_suffixes is _model_suffixes(norm_models); both directions of the
+    suffix match become set lookups.
+    """
+    # Exact match, or an AD model ending with the aircraft model
+    if norm_aircraft in model_suffixes:
+        return True
+    # Handle cases like "Boeing 737-800" matching "737-800"
+    return any(
+        norm_aircraft[i:] in norm_models for i in range(1, len(norm_aircraft) + 1)
+    )
 
 
 def model_matches(aircraft_model: str, ad_models: list[str]) -> bool:
@@ -30,85 +73,349 @@ def msn_matches(msn: int, msn_constraint) -> bool:
         return True
     if msn_constraint.type == "range":
         min_msn = msn_constraint.min_msn or 0
-        max_msn = msn_constraint.max_msn or float("inf")
-        return min_msn <= msn <= max_msn
+        max_msn = msn_constraint.max_msn
+        return min_msn <= msn and (not max_msn or msn <= max_msn)
     if msn_constraint.type == "list":
-        return msn in (msn_constraint.values or [])
+        return msn in msn_constraint.values_set
     return True
 
 
+# Parsed modification: ((SB number, revision or None), ...) plus plain mod keys
+_ParsedMod = tuple[tuple[tuple[str, int | None], ...], frozenset[str]]
+
+
+@lru_cache(maxsize=4096)
+def _parse_mod(mod: str) -> _ParsedMod:
+    """
+    Parse a modification string into every key it carries.
+
+    Returns (sbs, tokens): sbs holds (SB number, revision) for each service
+    bulletin in the string, with revision None if unspecified; tokens holds
+    "mod NNNNN" for each modification number, including bare ones such as
+    "24591". A string with neither is kept as its base text, so
+    "SB A320-57-1060 (mod 24591)" yields both the SB and "mod 24591".
+    Fleets repeat the same few strings, so each is scanned only once.
+    """
+    lower = mod.strip().lower()
+    sb_matches = list(_AM_SB_RE.finditer(lower))
+    sbs = []
+    for i, sb in enumerate(sb_matches):
+        # A revision belongs to the SB it follows, up to the next SB
+        stop = sb_matches[i + 1].start() if i + 1 < len(sb_matches) else len(lower)
+        rev = _REV_RE.search(lower, sb.end(), stop)
+        sbs.append((sb.group(0), int(rev.group(1)) if rev else None))
+    tokens = {f"mod {m.group(1)}" for m in _MOD_NUM_RE.finditer(lower)}
+    # Remove context like "(production)" or "(service)" for comparison
+    base = lower.split("(")[0].strip()
+    if _BARE_MOD_RE.fullmatch(base):
+        tokens.add(f"mod {base}")
+    if not sbs and not tokens and base:
+        tokens.add(base)
+    return tuple(sbs), frozenset(tokens)
+
+
+@lru_cache(maxsize=256)
+def _index_exclusions(
+    excluded_mods: tuple[str, ...],
+) -> tuple[dict[str, set[int | None]], frozenset[str]]:
+    """
+    Index exclusions as {SB number: {revisions}} plus a set of plain mod keys.
+
+    Cached per exclusion list; callers must not mutate the returned index.
+    """
+    exc_sb_index: dict[str, set[int | None]] = {}
+    exc_mod_tokens: set[str] = set()
+    for exc in excluded_mods:
+        sbs, tokens = _parse_mod(exc)
+        for sb, rev in sbs:
+            exc_sb_index.setdefault(sb, set()).add(rev)
+        exc_mod_tokens.update(tokens)
+    return exc_sb_index, frozenset(exc_mod_tokens)
+
+
+def _matches_exclusion(
+    parsed_mod: _ParsedMod,
+    exc_sb_index: dict[str, set[int | None]],
+    exc_mod_tokens: frozenset[str],
+) -> bool:
+    """Check every key of a parsed aircraft modification against indexed exclusions."""
+    sbs, tokens = parsed_mod
+    # "mod 24591" matches "mod 24591 (production)"
+    if not tokens.isdisjoint(exc_mod_tokens):
+        return True
+    for sb, rev in sbs:
+        exc_revs = exc_sb_index.get(sb)
+        if exc_revs is None:
+            continue
+        # An exclusion without a revision matches any revision; an aircraft
+        # mod without a revision matches any excluded revision of the same SB
+        if rev is None or None in exc_revs or rev in exc_revs:
+            return True
+    return False
+
+
 def has_excluding_modification(
     aircraft_mods: list[str], excluded_mods: list[str]
 ) -> bool:
     """Check if the aircraft has any modification that excludes it from the AD."""
-    for aircraft_mod in aircraft_mods:
-        am_lower = aircraft_mod.strip().lower()
-        for exc in excluded_mods:
-            exc_lower = exc.strip().lower()
-            # Remove context like "(production)" or "(service)" for comparison
-            exc_base = exc_lower.split("(")[0].strip()
-            # Check various match patterns
-            if am_lower == exc_lower or am_lower == exc_base:
-                return True
-            # Partial: "mod 24591" matches "mod 24591 (production)"
-            if exc_base in am_lower or am_lower in exc_base:
-                return True
-            # SB matching: "SB A320-57-1089 Rev 04" should match "SB A320-57-1089 Rev 04"
-            # Also "SB A320-57-1089" in aircraft mods should match "SB A320-57-1089 Rev 04" in exclusions
-            if "sb " in am_lower and "sb " in exc_base:
-                # Extract SB number from both
-                am_sb = re.search(r'(a3\d{2}-\d{2}-\d{4})', am_lower)
-                exc_sb = re.search(r'(a3\d{2}-\d{2}-\d{4})', exc_base)
-                if am_sb and exc_sb and am_sb.group(1) == exc_sb.group(1):
-                    # SB numbers match, now check revision
-                    am_rev = re.search(r'rev(?:ision)?\s*(\d+)', am_lower)
-                    exc_rev = re.search(r'rev(?:ision)?\s*(\d+)', exc_base)
-                    if exc_rev and am_rev:
-                        # Both have revisions, must match
-                        if am_rev.group(1) == exc_rev.group(1):
-                            return True
-                    elif exc_rev and not am_rev:
-                        # Exclusion specifies rev but aircraft mod doesn't — still match
-                        return True
-                    elif not exc_rev:
-                        # Exclusion doesn't specify rev — any rev matches
-                        return True
-    return False
+    if not aircraft_mods or not excluded_mods:
+        return False
+    exc_sb_index, exc_mod_tokens = _index_exclusions(tuple(excluded_mods))
+    return any(
+        _matches_exclusion(_parse_mod(aircraft_mod), exc_sb_index, exc_mod_tokens)
+        for aircraft_mod in aircraft_mods
+    )
+
+
+# MSN constraint kinds, resolved from MsnConstraint.type once per AD
+_MSN_ALL, _MSN_RANGE, _MSN_LIST = 0, 1, 2
+_MSN_TYPE_IDS = {"range": _MSN_RANGE, "list": _MSN_LIST}
+
+
+@dataclass(frozen=True)
+class _CompiledMsn:
+    """MSN constraint with its type as an int tag (max_msn None = unbounded)."""
+    type_id: int
+    min_msn: int = 0
+    max_msn: int | None = None
+    values: frozenset[int] = frozenset()
+
+
+def _compile_msn(msn_constraint: MsnConstraint | None) -> _CompiledMsn:
+    """Resolve an MSN constraint into the form used by _compiled_msn_matches."""
+    if msn_constraint is None:
+        return _CompiledMsn(_MSN_ALL)
+    # "all" and unknown types both match every MSN, as in msn_matches
+    type_id = _MSN_TYPE_IDS.get(msn_constraint.type, _MSN_ALL)
+    return _CompiledMsn(
+        type_id=type_id,
+        min_msn=msn_constraint.min_msn or 0,
+        max_msn=msn_constraint.max_msn or None,
+        values=msn_constraint.values_set,
+    )
+
+
+def _compiled_msn_matches(msn: int, compiled_msn: _CompiledMsn) -> bool:
+    """Same as msn_matches, against a compiled MSN constraint."""
+    type_id = compiled_msn.type_id
+    if type_id == _MSN_ALL:
+        return True
+    if type_id == _MSN_RANGE:
+        max_msn = compiled_msn.max_msn
+        return compiled_msn.min_msn <= msn and (max_msn is None or msn <= max_msn)
+    return msn in compiled_msn.values
+
+
+@dataclass(frozen=True)
+class _CompiledAD:
+    """AD applicability rules preprocessed once for repeated evaluation."""
+    ad_id: str
+    normalized_models: frozenset[str]
+    model_suffixes: frozenset[str]
+    exc_sb_index: dict[str, set[int | None]]
+    exc_mod_tokens: frozenset[str]
+    msn: _CompiledMsn
 
 
-def is_affected(aircraft: AircraftConfig, ad: AirworthinessDirective) -> bool:
+# compile_ad() results by id() of live ADs; entries are dropped when the AD is collected
+_COMPILED_ADS: dict[int, tuple[ApplicabilityRules, str, _CompiledAD]] = {}
+
+
+def compile_ad(ad: AirworthinessDirective) -> _CompiledAD:
+    """
+    Normalize models and index exclusions of an AD for evaluation.
+
+    The result is cached per AD object, so is_affected() and
+    evaluate_aircraft() compile each AD only once. Replacing an AD's
+    applicability_rules or ad_id recompiles it; the rules themselves are
+    frozen with tuple fields, so they cannot change in place.
+    """
+    key = id(ad)
+    cached = _COMPILED_ADS.get(key)
+    if cached is not None and cached[0] is ad.applicability_rules and cached[1] == ad.ad_id:
+        return cached[2]
+    compiled = _compile_ad(ad)
+    if cached is None:
+        weakref.finalize(ad, _COMPILED_ADS.pop, key, None)
+    _COMPILED_ADS[key] = (ad.applicability_rules, ad.ad_id, compiled)
+    return compiled
+
+
+def _compile_ad(ad: AirworthinessDirective) -> _CompiledAD:
+    """Build the _CompiledAD for an AD (uncached)."""
+    rules = ad.applicability_rules
+    norm_models = frozenset(normalize_model(m) for m in rules.aircraft_models)
+    exc_sb_index, exc_mod_tokens = _index_exclusions(
+        tuple(rules.excluded_if_modifications)
+    )
+    return _CompiledAD(
+        ad_id=ad.ad_id,
+        normalized_models=norm_models,
+        model_suffixes=_model_suffixes(norm_models),
+        exc_sb_index=exc_sb_index,
+        exc_mod_tokens=exc_mod_tokens,
+        msn=_compile_msn(rules.msn_constraints),
+    )
+
+
+def is_affected(
+    aircraft: AircraftConfig, ad: AirworthinessDirective | _CompiledAD
+) -> bool:
     """
     Determine if a specific aircraft configuration is affected by an AD.
 
+    Accepts either an AD or the result of compile_ad(); plain ADs are
+    compiled once and cached.
+
     Returns True if the aircraft IS affected (needs action).
     Returns False if the aircraft is NOT affected/applicable.
     """
-    rules = ad.applicability_rules
+    compiled = ad if isinstance(ad, _CompiledAD) else compile_ad(ad)
 
     # Step 1: Check if aircraft model is in the AD's applicability
-    if not model_matches(aircraft.aircraft_model, rules.aircraft_models):
+    if not _normalized_model_matches(
+        aircraft.normalized_model, compiled.normalized_models, compiled.model_suffixes
+    ):
         return False
 
+    parsed_mods = [_parse_mod(mod) for mod in aircraft.modifications_applied]
+    return _passes_constraints(aircraft.msn, parsed_mods, compiled)
+
+
+def _passes_constraints(
+    msn: int,
+    parsed_mods: list[_ParsedMod],
+    compiled: _CompiledAD,
+) -> bool:
+    """Apply the MSN and modification checks of is_affected (model already matched)."""
     # Step 2: Check MSN constraints
-    if not msn_matches(aircraft.msn, rules.msn_constraints):
+    if not _compiled_msn_matches(msn, compiled.msn):
         return False
 
     # Step 3: Check if aircraft has a modification that excludes it
-    if aircraft.modifications_applied and rules.excluded_if_modifications:
-        if has_excluding_modification(
-            aircraft.modifications_applied, rules.excluded_if_modifications
-        ):
-            return False
+    return not _excluded_by_mods(parsed_mods, compiled)
 
-    return True
+
+def _excluded_by_mods(
+    parsed_mods: list[_ParsedMod], compiled: _CompiledAD
+) -> bool:
+    """Check parsed aircraft modifications against a compiled AD's exclusions."""
+    if not parsed_mods or not (compiled.exc_sb_index or compiled.exc_mod_tokens):
+        return False
+    return any(
+        _matches_exclusion(parsed, compiled.exc_sb_index, compiled.exc_mod_tokens)
+        for parsed in parsed_mods
+    )
 
 
 def evaluate_aircraft(
-    aircraft: AircraftConfig, ads: list[AirworthinessDirective]
+    aircraft: AircraftConfig, ads: list[AirworthinessDirective | _CompiledAD]
 ) -> dict[str, str]:
     """Evaluate an aircraft against multiple ADs."""
+    # Normalize the model and parse the modifications once for all ADs
+    norm_aircraft = aircraft.normalized_model
+    parsed_mods = [_parse_mod(mod) for mod in aircraft.modifications_applied]
     results = {}
     for ad in ads:
-        affected = is_affected(aircraft, ad)
+        compiled = ad if isinstance(ad, _CompiledAD) else compile_ad(ad)
+        affected = _normalized_model_matches(
+            norm_aircraft, compiled.normalized_models, compiled.model_suffixes
+        ) and _passes_constraints(aircraft.msn, parsed_mods, compiled)
         results[ad.ad_id] = "Affected" if affected else "Not applicable"
     return results
+
+
+@dataclass(frozen=True)
+class _ModelIndex:
+    """Inverted index from normalized models to positions in a compiled AD list."""
+    # Full normalized AD model -> ADs; hit by every suffix of the aircraft model
+    model_to_ads: dict[str, list[int]]
+    # Every suffix of every AD model -> ADs; hit by the full aircraft model
+    suffix_to_ads: dict[str, list[int]]
+
+
+def _build_model_index(compiled_ads: list[_CompiledAD]) -> _ModelIndex:
+    """Index compiled ADs by normalized model and by model suffix."""
+    model_to_ads: dict[str, list[int]] = {}
+    suffix_to_ads: dict[str, list[int]] = {}
+    for i, compiled in enumerate(compiled_ads):
+        for norm_ad in compiled.normalized_models:
+            model_to_ads.setdefault(norm_ad, []).append(i)
+        for suffix in compiled.model_suffixes:
+            suffix_to_ads.setdefault(suffix, []).append(i)
+    return _ModelIndex(model_to_ads=model_to_ads, suffix_to_ads=suffix_to_ads)
+
+
+def _candidate_ads(norm_aircraft: str, index: _ModelIndex) -> set[int]:
+    """Positions of ADs whose models match the aircraft model."""
+    # AD model ends with the aircraft model (includes exact matches)
+    candidates = set(index.suffix_to_ads.get(norm_aircraft, ()))
+    # Aircraft model ends with the AD model, e.g. "BOEING-737-800" / "737-800"
+    for j in range(len(norm_aircraft) + 1):
+        candidates.update(index.model_to_ads.get(norm_aircraft[j:], ()))
+    return candidates
+
+
+def _fleet_msn_mask(aircrafts: list[AircraftConfig], compiled_ads: list[_CompiledAD]):
+    """
+    Boolean (aircraft x AD) array of msn_matches results, computed with NumPy.
+
+    Raises OverflowError if an MSN or constraint bound does not fit in int64.
+    """
+    msns = np.fromiter((a.msn for a in aircrafts), dtype=np.int64, count=len(aircrafts))
+    # "all" (and unknown) constraints become the full int64 range
+    mins = np.full(len(compiled_ads), np.iinfo(np.int64).min, dtype=np.int64)
+    maxs = np.full(len(compiled_ads), np.iinfo(np.int64).max, dtype=np.int64)
+    list_columns = []
+    for i, compiled in enumerate(compiled_ads):
+        if compiled.msn.type_id == _MSN_RANGE:
+            mins[i] = compiled.msn.min_msn
+            if compiled.msn.max_msn is not None:
+                maxs[i] = compiled.msn.max_msn
+        elif compiled.msn.type_id == _MSN_LIST:
+            list_columns.append((i, compiled.msn.values))
+
+    mask = (msns[:, None] >= mins[None, :]) & (msns[:, None] <= maxs[None, :])
+    for i, values in list_columns:
+        mask[:, i] = np.isin(msns, np.fromiter(values, dtype=np.int64, count=len(values)))
+    return mask
+
+
+def evaluate_fleet(
+    aircrafts: list[AircraftConfig], ads: list[AirworthinessDirective]
+) -> list[list[str]]:
+    """
+    Evaluate many aircraft against multiple ADs.
+
+    Returns one row per aircraft holding "Affected" / "Not applicable" for
+    each AD, by position in ads (AD ids are not necessarily unique).
+
+    Each AD is compiled once and indexed by model, so only ADs whose
+    models match an aircraft go through the MSN and modification checks.
+    For large fleets the MSN checks run as one NumPy pass when available.
+    """
+    compiled_ads = [compile_ad(ad) for ad in ads]
+    index = _build_model_index(compiled_ads)
+    msn_mask = None
+    if np is not None and len(aircrafts) * len(compiled_ads) >= _NUMPY_MIN_PAIRS:
+        try:
+            msn_mask = _fleet_msn_mask(aircrafts, compiled_ads)
+        except OverflowError:
+            pass  # Values beyond int64: use the scalar path, which handles any int
+
+    fleet_results = []
+    for row, aircraft in enumerate(aircrafts):
+        parsed_mods = [_parse_mod(mod) for mod in aircraft.modifications_applied]
+        affected = {
+            i for i in _candidate_ads(aircraft.normalized_model, index)
+            if (
+                msn_mask[row, i] if msn_mask is not None
+                else _compiled_msn_matches(aircraft.msn, compiled_ads[i].msn)
+            )
+            and not _excluded_by_mods(parsed_mods, compiled_ads[i])
+        }
+        fleet_results.append([
+            "Affected" if i in affected else "Not applicable"
+            for i in range(len(compiled_ads))
+        ])
+    return fleet_results
@@ -1,23 +1,94 @@
 """Extraction pipeline: extracts applicability rules from AD PDFs."""
 from __future__ import annotations
+import hashlib
+import json
+import os
 import re
+import sys
 import pdfplumber
+from pydantic import ValidationError
+try:
+    # Optional: RE2 runs the multi-pattern page scan as a linear-time DFA
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
 from models import (
     AirworthinessDirective,
     ApplicabilityRules,
     MsnConstraint,
 )
 
+# On-disk cache of extraction results; bump the version when extraction changes
+AD_CACHE_DIR = ".ad_cache"
+_AD_CACHE_VERSION = 1
+
+# ── Precompiled patterns ──
+# AD identifiers: "AD 2025-23-53" / "2025–23–53" (FAA), "AD No.: 2025-0254R1" (EASA)
+_FAA_AD_RE = re.compile(r'AD\s+(\d{4}[-–]\d{2}[-–]\d{2,4})')
+_EASA_AD_RE = re.compile(r'AD\s+(?:No\.?\s*:?\s*)?(\d{4}[-–]\d{4})(?:R\d+)?')
+
+# Aircraft models, service bulletins and modifications, fused into one scan:
+# MD-11, MD-11F, DC-10-30F / A320-214, A321-111 / SB A320-57-1089 / mod 24591
+_ALL_REFS_RE = _re_engine.compile(
+    r'\b(?P<md_dc>(?:MD|DC)-\d{1,2}(?:-\d{1,3})?[A-Z]?)\b'
+    r'|\b(?P<airbus>A3(?:19|20|21)-\d{3}[A-Z]?)\b'
+    r'|(?:SB\s+)?(?P<sb>A3\d{2}-\d{2}-\d{4})'
+    r'|(?i:\bmod(?:ification)?\s+(?P<mod>\d{4,6})\b)'
+)
+# Every model and SB match contains one of these; pages without them are skipped
+_MODEL_SB_KEYWORDS = ("A3", "MD-", "DC-")
+
+# MSN constraints (matched against lowercased text)
+_MSN_ALL_RE = re.compile(r'all\s+(?:manufacturer\s+serial\s+numbers|msn)')
+_APPLIES_ALL_RE = re.compile(r'applies?\s+to\s+all\b')
+_MSN_RANGE_RE = re.compile(r'msn\s+(\d+)\s+(?:through|to|thru|-)\s+(\d+)')
+
+# EASA applicability section (sliced with str.find) and its exclusion clauses
+_APP_START = "Applicability:"
+_APP_ENDS = ("Definitions:", "Reason:")
+_EXCEPT_BLOCK_RE = re.compile(
+    r'except\s+those\s+on\s+which\s+(.*?)(?:;|\.|\n\n)', re.DOTALL | re.IGNORECASE
+)
+_CLAUSE_MOD_RES = (
+    re.compile(r'mod(?:ification)?\s*\(mod\)\s*(\d{4,6})', re.IGNORECASE),
+    re.compile(r'mod\s+(\d{4,6})', re.IGNORECASE),
+    re.compile(r'\(mod\)\s+(\d{4,6})', re.IGNORECASE),
+)
+_SB_REV_RE = re.compile(
+    r'(?:SB\s+)?(A3\d{2}-\d{2}-\d{4})(?:\s+(?:at\s+)?(?:Rev(?:ision)?\s+(\d+)))?',
+    re.IGNORECASE,
+)
+_REQUIRED_SB_RE = re.compile(
+    r'modify the aeroplane in accordance with.*?(SB\s+A3\d{2}-\d{2}-\d{4}(?:\s+Rev(?:ision)?\s+\d+)?)',
+    re.IGNORECASE,
+)
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract all text from a PDF file."""
+# Metadata: subject line and effective date
+_SUBJECT_RE = re.compile(r'ATA\s+\d+\s*[–—-]\s*(.*?)(?:\n|Manufacturer)')
+_SUBJECT_FALLBACK_RE = re.compile(r'Nacelles/pylons|Wing.*?Inspection')
+_EASA_DATE_RE = re.compile(r'Effective\s+Date.*?(\d{1,2}\s+\w+\s+\d{4})')
+_FAA_DATE_RE = re.compile(r'effective\s+(?:on\s+)?(\w+\s+\d{1,2},?\s+\d{4})', re.IGNORECASE)
+
+
+def extract_pages_from_pdf(pdf_path: str) -> list[str]:
+    """Extract the text of each non-empty page of a PDF file."""
     pages_text = []
     with pdfplumber.open(pdf_path) as pdf:
         for page in pdf.pages:
             text = page.extract_text()
             if text:
                 pages_text.append(text)
-    return "\n".join(pages_text)
+    return pages_text
+
+
+def extract_text_from_pdf(pdf_path: str) -> str:
+    """Extract all text from a PDF file."""
+    return "\n".join(extract_pages_from_pdf(pdf_path))
+
+
+def _as_pages(text: str | list[str]) -> list[str]:
+    """Accept either the full document text or a list of page texts."""
+    return [text] if isinstance(text, str) else text
 
 
 def detect_authority(text: str, filename: str) -> str:
@@ -34,52 +105,53 @@ def extract_ad_id(text: str, authority: str) -> str:
     """Extract the AD identifier from the text."""
     if authority == "FAA":
         # Pattern: AD 2025-23-53 or 2025–23–53
-        match = re.search(r'AD\s+(\d{4}[-–]\d{2}[-–]\d{2,4})', text)
+        match = _FAA_AD_RE.search(text)
         if match:
             return "FAA-" + match.group(1).replace("–", "-")
     if authority == "EASA":
-        match = re.search(r'AD\s+(?:No\.?\s*:?\s*)?(\d{4}[-–]\d{4})(?:R\d+)?', text)
+        match = _EASA_AD_RE.search(text)
         if match:
             return "EASA-" + match.group(1).replace("–", "-")
     return "UNKNOWN"
 
 
-def extract_aircraft_models(text: str) -> list[str]:
-    """Extract aircraft model designations from the text."""
-    models = set()
+def _sorted_interned(refs: set[str]) -> tuple[str, ...]:
+    """Sorted, interned and immutable form of a set of references."""
+    return tuple(sorted(map(sys.intern, refs)))
+
 
-    # Pattern for Boeing/McDonnell Douglas models: MD-11, MD-11F, DC-10-30F, etc.
-    md_dc_pattern = r'\b((?:MD|DC)-\d{1,2}(?:-\d{1,3})?[A-Z]?)\b'
-    for m in re.finditer(md_dc_pattern, text):
-        model = m.group(1)
-        # Filter out things like DC-10 standalone when we have specific variants
-        models.add(model)
+def extract_references(
+    text: str | list[str],
+) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    """Extract aircraft models, service bulletins and mod references in one pass."""
+    models = set()
+    sbs = set()
+    mods = set()
+    for page in _as_pages(text):
+        for m in _ALL_REFS_RE.finditer(page):
+            kind = m.lastgroup
+            if kind == "sb":
+                sbs.add("SB " + m.group(kind))
+            elif kind == "mod":
+                mods.add(f"mod {m.group(kind)}")
+            else:
+                models.add(m.group(kind))
+    return _sorted_interned(models), _sorted_interned(sbs), _sorted_interned(mods)
 
-    # Pattern for Airbus models: A320-214, A321-111, etc.
-    airbus_pattern = r'\b(A3(?:19|20|21)-\d{3}[A-Z]?)\b'
-    for m in re.finditer(airbus_pattern, text):
-        models.add(m.group(1))
 
-    return sorted(models)
+def extract_aircraft_models(text: str | list[str]) -> tuple[str, ...]:
+    """Extract aircraft model designations from the text or its pages."""
+    return extract_references(text)[0]
 
 
-def extract_service_bulletins(text: str) -> list[str]:
+def extract_service_bulletins(text: str | list[str]) -> tuple[str, ...]:
     """Extract service bulletin references."""
-    sbs = set()
-    # Pattern: SB A320-57-1089, Airbus SB A320-57-1060, etc.
-    sb_pattern = r'(?:SB\s+)?(A3\d{2}-\d{2}-\d{4})'
-    for m in re.finditer(sb_pattern, text):
-        sbs.add("SB " + m.group(1))
-    return sorted(sbs)
+    return extract_references(text)[1]
 
 
-def extract_mod_references(text: str) -> list[str]:
+def extract_mod_references(text: str | list[str]) -> tuple[str, ...]:
     """Extract modification references (mod XXXXX)."""
-    mods = set()
-    mod_pattern = r'\bmod(?:ification)?\s+(\d{4,6})\b'
-    for m in re.finditer(mod_pattern, text, re.IGNORECASE):
-        mods.add(f"mod {m.group(1)}")
-    return sorted(mods)
+    return extract_references(text)[2]
 
 
 def extract_msn_constraints(text: str) -> MsnConstraint | None:
@@ -87,17 +159,15 @@ def extract_msn_constraints(text: str) -> MsnConstraint | None:
     text_lower = text.lower()
 
     # Check for "all manufacturer serial numbers" or "all MSN" pattern
-    if re.search(r'all\s+(?:manufacturer\s+serial\s+numbers|msn)', text_lower):
+    if _MSN_ALL_RE.search(text_lower):
         return MsnConstraint(type="all")
 
     # Check for "applies to all" pattern
-    if re.search(r'applies?\s+to\s+all\b', text_lower):
+    if _APPLIES_ALL_RE.search(text_lower):
         return MsnConstraint(type="all")
 
     # Check for MSN range
-    msn_range = re.search(
-        r'msn\s+(\d+)\s+(?:through|to|thru|-)\s+(\d+)', text_lower
-    )
+    msn_range = _MSN_RANGE_RE.search(text_lower)
     if msn_range:
         return MsnConstraint(
             type="range",
@@ -108,38 +178,42 @@ def extract_msn_constraints(text: str) -> MsnConstraint | None:
     return MsnConstraint(type="all")
 
 
-def parse_easa_applicability(text: str) -> dict:
+def _applicability_section(text: str) -> str:
+    """Text between "Applicability:" and the next "Definitions:"/"Reason:" (or the end)."""
+    start = text.find(_APP_START)
+    if start < 0:
+        return text
+    start += len(_APP_START)
+    ends = [i for i in (text.find(k, start) for k in _APP_ENDS) if i >= 0]
+    return text[start:min(ends, default=len(text))].lstrip()
+
+
+def parse_easa_applicability(text: str | list[str]) -> dict:
     """Parse EASA-specific applicability details including mod/SB exclusions."""
     excluded_mods = []
     required_mods = []
     notes = []
+    pages = _as_pages(text)
 
-    # Look for the Applicability section specifically
-    app_match = re.search(r'Applicability:\s*(.*?)(?:Definitions:|Reason:|$)', text, re.DOTALL)
-    app_text = app_match.group(1) if app_match else text
+    # Look for the Applicability section specifically, starting from its page
+    app_page = next((i for i, page in enumerate(pages) if _APP_START in page), 0)
+    app_text = _applicability_section("\n".join(pages[app_page:]))
 
     # Pattern: "except those on which ... mod XXXXX has been embodied in production"
-    except_blocks = re.finditer(
-        r'except\s+those\s+on\s+which\s+(.*?)(?:;|\.|\n\n)',
-        app_text, re.DOTALL | re.IGNORECASE
-    )
-    for block in except_blocks:
+    for block in _EXCEPT_BLOCK_RE.finditer(app_text):
         clause = block.group(1)
         # Extract mod references
-        mod_refs = re.findall(r'mod(?:ification)?\s*\(mod\)\s*(\d{4,6})', clause, re.IGNORECASE)
-        if not mod_refs:
-            mod_refs = re.findall(r'mod\s+(\d{4,6})', clause, re.IGNORECASE)
-        if not mod_refs:
-            mod_refs = re.findall(r'\(mod\)\s+(\d{4,6})', clause, re.IGNORECASE)
+        mod_refs = []
+        for mod_re in _CLAUSE_MOD_RES:
+            mod_refs = mod_re.findall(clause)
+            if mod_refs:
+                break
         for mod in mod_refs:
             context = "production" if "production" in clause.lower() else "service"
             excluded_mods.append(f"mod {mod} ({context})")
 
         # Extract SB references with revision
-        sb_refs = re.findall(
-            r'(?:SB\s+)?(A3\d{2}-\d{2}-\d{4})(?:\s+(?:at\s+)?(?:Rev(?:ision)?\s+(\d+)))?',
-            clause, re.IGNORECASE
-        )
+        sb_refs = _SB_REV_RE.findall(clause)
         for sb_match in sb_refs:
             sb_name = sb_match[0]
             sb_rev = sb_match[1] if sb_match[1] else None
@@ -149,9 +223,12 @@ def parse_easa_applicability(text: str) -> dict:
                 excluded_mods.append(f"SB {sb_name}")
 
     # Look for required modifications (from Required Action section)
-    req_match = re.search(r'modify the aeroplane in accordance with.*?(SB\s+A3\d{2}-\d{2}-\d{4}(?:\s+Rev(?:ision)?\s+\d+)?)', text, re.IGNORECASE)
-    if req_match:
-        required_mods.append(req_match.group(1).strip())
+    # The pattern does not cross line breaks, so pages can be searched one by one
+    for page in pages:
+        req_match = _REQUIRED_SB_RE.search(page)
+        if req_match:
+            required_mods.append(req_match.group(1).strip())
+            break
 
     return {
         "excluded_if_modifications": sorted(set(excluded_mods)),
@@ -162,14 +239,17 @@ def parse_easa_applicability(text: str) -> dict:
 
 def extract_from_pdf(pdf_path: str) -> AirworthinessDirective:
     """Main extraction function: PDF -> structured AD record."""
-    text = extract_text_from_pdf(pdf_path)
+    pages = extract_pages_from_pdf(pdf_path)
+    text = "\n".join(pages)
     filename = pdf_path.split("/")[-1].split("\\")[-1]
 
     authority = detect_authority(text, filename)
     ad_id = extract_ad_id(text, authority)
-    models = extract_aircraft_models(text)
+    # Only models and SBs are used here, so pages that cannot contain them
+    # (cover sheets, boilerplate) skip the reference scan
+    ref_pages = [p for p in pages if any(k in p for k in _MODEL_SB_KEYWORDS)]
+    models, service_bulletins, _ = extract_references(ref_pages)
     msn_constraint = extract_msn_constraints(text)
-    service_bulletins = extract_service_bulletins(text)
 
     # Detect manufacturer
     manufacturer = None
@@ -180,23 +260,23 @@ def extract_from_pdf(pdf_path: str) -> AirworthinessDirective:
 
     # Extract subject
     subject = None
-    subj_match = re.search(r'ATA\s+\d+\s*[–—-]\s*(.*?)(?:\n|Manufacturer)', text)
+    subj_match = _SUBJECT_RE.search(text)
     if subj_match:
         subject = subj_match.group(1).strip()
     if not subject:
-        subj_match = re.search(r'Nacelles/pylons|Wing.*?Inspection', text)
+        subj_match = _SUBJECT_FALLBACK_RE.search(text)
         if subj_match:
             subject = subj_match.group(0).strip()
 
     # Extract effective date
     eff_date = None
     # EASA format: "Effective Date: Revision 01: 08 December 2025"
-    date_match = re.search(r'Effective\s+Date.*?(\d{1,2}\s+\w+\s+\d{4})', text)
+    date_match = _EASA_DATE_RE.search(text)
     if date_match:
         eff_date = date_match.group(1).strip()
     if not eff_date:
         # FAA format: "effective on December 1, 2025"
-        date_match = re.search(r'effective\s+(?:on\s+)?(\w+\s+\d{1,2},?\s+\d{4})', text, re.IGNORECASE)
+        date_match = _FAA_DATE_RE.search(text)
         if date_match:
             eff_date = date_match.group(1).strip()
 
@@ -206,7 +286,7 @@ def extract_from_pdf(pdf_path: str) -> AirworthinessDirective:
     notes = None
 
     if authority == "EASA":
-        easa_details = parse_easa_applicability(text)
+        easa_details = parse_easa_applicability(pages)
         excluded_mods = easa_details["excluded_if_modifications"]
         required_mods = easa_details["required_modifications"]
         notes = easa_details["notes"]
@@ -230,16 +310,58 @@ def extract_from_pdf(pdf_path: str) -> AirworthinessDirective:
     )
 
 
+def extract_from_pdf_cached(
+    pdf_path: str, cache_dir: str = AD_CACHE_DIR
+) -> AirworthinessDirective:
+    """extract_from_pdf, reusing the cached result while the PDF's mtime and size are unchanged."""
+    abs_path = os.path.abspath(pdf_path)
+    stat = os.stat(abs_path)
+    key = {
+        "version": _AD_CACHE_VERSION,
+        "path": abs_path,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+    cache_path = os.path.join(
+        cache_dir, hashlib.sha1(abs_path.encode("utf-8")).hexdigest() + ".json"
+    )
+
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if isinstance(cached, dict) and cached.get("key") == key:
+            return AirworthinessDirective.model_validate(cached["ad"])
+    except (OSError, ValueError, KeyError, ValidationError):
+        pass  # Missing, stale or unreadable cache entry: extract again
+
+    ad = extract_from_pdf(pdf_path)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "ad": ad.model_dump(mode="json")}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Unwritable cache (read-only checkout, cache_dir is a file, ...):
+        # the extraction result is still valid, so just skip caching it
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return ad
+
+
 if __name__ == "__main__":
-    import json
-    import sys
     import glob
+    from concurrent.futures import ProcessPoolExecutor
 
     pdf_files = sys.argv[1:] if len(sys.argv) > 1 else glob.glob("*.pdf")
 
-    for pdf_path in pdf_files:
+    with ProcessPoolExecutor() as executor:
+        ads = list(executor.map(extract_from_pdf_cached, pdf_files))
+
+    for pdf_path, ad in zip(pdf_files, ads):
         print(f"\n{'='*60}")
         print(f"Extracting from: {pdf_path}")
         print(f"{'='*60}")
-        ad = extract_from_pdf(pdf_path)
         print(json.dumps(ad.model_dump(), indent=2, default=str))
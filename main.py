@@ -2,9 +2,14 @@
 from __future__ import annotations
 import json
 import glob
-from extractor import extract_from_pdf
-from evaluator import evaluate_aircraft, is_affected
-from models import AircraftConfig
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from pydantic import TypeAdapter
+from extractor import extract_from_pdf_cached
+from evaluator import evaluate_fleet
+from models import AircraftConfig, AirworthinessDirective
+
+_ADS_ADAPTER = TypeAdapter(list[AirworthinessDirective])
 
 
 # ── Test aircraft configurations from the assignment ──
@@ -43,11 +48,12 @@ def main():
         print("ERROR: No PDF files found in current directory.")
         return
 
-    ads = []
-    for pdf_path in pdf_files:
+    # PDFs are independent and text extraction is CPU-bound: one process each
+    with ProcessPoolExecutor() as executor:
+        ads = list(executor.map(extract_from_pdf_cached, pdf_files))
+
+    for pdf_path, ad in zip(pdf_files, ads):
         print(f"\nProcessing: {pdf_path}")
-        ad = extract_from_pdf(pdf_path)
-        ads.append(ad)
         print(f"  AD ID: {ad.ad_id}")
         print(f"  Authority: {ad.issuing_authority}")
         print(f"  Models: {ad.applicability_rules.aircraft_models}")
@@ -59,9 +65,7 @@ def main():
     ads.sort(key=lambda a: (0 if a.issuing_authority == "FAA" else 1, a.ad_id))
 
     # Save structured output
-    output = [ad.model_dump() for ad in ads]
-    with open("extracted_rules.json", "w") as f:
-        json.dump(output, f, indent=2, default=str)
+    Path("extracted_rules.json").write_bytes(_ADS_ADAPTER.dump_json(ads, indent=2))
     print(f"\nStructured rules saved to: extracted_rules.json")
 
     # ── Step 2: Evaluate test aircraft ──
@@ -78,7 +82,8 @@ def main():
     print("-" * len(header))
 
     results_table = []
-    for ac in TEST_AIRCRAFT:
+    fleet_results = evaluate_fleet(TEST_AIRCRAFT, ads)
+    for ac, ac_results in zip(TEST_AIRCRAFT, fleet_results):
         mods_str = ", ".join(ac.modifications_applied) if ac.modifications_applied else "None"
         row = f"{ac.aircraft_model:<18} {ac.msn:<8} {mods_str:<30}"
         row_data = {
@@ -86,11 +91,10 @@ def main():
             "msn": ac.msn,
             "modifications": ac.modifications_applied,
         }
-        for ad in ads:
-            affected = is_affected(ac, ad)
-            status = "✅ Affected" if affected else "❌ Not applicable"
+        for ad, result in zip(ads, ac_results):
+            status = "✅ Affected" if result == "Affected" else "❌ Not applicable"
             row += f" {status:<22}"
-            row_data[ad.ad_id] = "Affected" if affected else "Not applicable"
+            row_data[ad.ad_id] = result
         print(row)
         results_table.append(row_data)
 
@@ -105,15 +109,14 @@ def main():
     print("=" * 70)
 
     all_pass = True
-    for i, v in enumerate(VERIFICATION, 1):
+    verification_results = evaluate_fleet([v["aircraft"] for v in VERIFICATION], ads)
+    for i, (v, ac_results) in enumerate(zip(VERIFICATION, verification_results), 1):
         ac = v["aircraft"]
         expected = v["expected"]
         mods_str = ", ".join(ac.modifications_applied) if ac.modifications_applied else "None"
         print(f"\nVerification {i}: {ac.aircraft_model} MSN {ac.msn} ({mods_str})")
 
-        for ad in ads:
-            affected = is_affected(ac, ad)
-            actual = "Affected" if affected else "Not applicable"
+        for ad, actual in zip(ads, ac_results):
 
             # Try matching with both possible AD ID formats
             exp_val = None
@@ -1,22 +1,47 @@
-"""Pydantic models for structured AD applicability rules."""
+"""Data models for structured AD applicability rules.
+
+AirworthinessDirective is a pydantic model for JSON (de)serialization; the
+records it embeds and AircraftConfig are slotted pydantic dataclasses, which
+validate and coerce their fields on construction.
+"""
 from __future__ import annotations
+import sys
+from dataclasses import field
+from functools import lru_cache
 from pydantic import BaseModel
+from pydantic.dataclasses import dataclass
+
+# Spaces and en dashes in model designations become plain hyphens
+_NORM_TABLE = str.maketrans({" ": "-", "–": "-"})
+
 
+@lru_cache(maxsize=1024)
+def normalize_model(model: str) -> str:
+    """Normalize model string for comparison (interned, so equal models share one object)."""
+    return sys.intern(model.strip().upper().translate(_NORM_TABLE))
 
-class MsnConstraint(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class MsnConstraint:
     """MSN range or list constraint."""
     type: str  # "all", "range", "list"
-    values: list[int] | None = None
+    values: tuple[int, ...] | None = None
     min_msn: int | None = None
     max_msn: int | None = None
+    # O(1) membership view of values; not serialized (init=False)
+    values_set: frozenset[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "values_set", frozenset(self.values or ()))
 
 
-class ApplicabilityRules(BaseModel):
-    """Structured applicability rules extracted from an AD."""
-    aircraft_models: list[str]
+@dataclass(slots=True, frozen=True)
+class ApplicabilityRules:
+    """Structured applicability rules extracted from an AD (immutable: lists become tuples)."""
+    aircraft_models: tuple[str, ...]
     msn_constraints: MsnConstraint | None = None
-    excluded_if_modifications: list[str] = []
-    required_modifications: list[str] = []
+    excluded_if_modifications: tuple[str, ...] = ()
+    required_modifications: tuple[str, ...] = ()
     notes: str | None = None
 
 
@@ -28,11 +53,17 @@ class AirworthinessDirective(BaseModel):
     subject: str | None = None
     aircraft_manufacturer: str | None = None
     applicability_rules: ApplicabilityRules
-    related_service_bulletins: list[str] = []
+    related_service_bulletins: tuple[str, ...] = ()
 
 
-class AircraftConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AircraftConfig:
     """An aircraft configuration to evaluate against ADs."""
     aircraft_model: str
     msn: int
-    modifications_applied: list[str] = []
+    modifications_applied: list[str] = field(default_factory=list)
+
+    @property
+    def normalized_model(self) -> str:
+        """aircraft_model in the normalized form used for matching."""
+        return normalize_model(self.aircraft_model)